@@ -6,13 +6,52 @@ Trace:
   task_id: TASK-004
 """
 
+import html
 import os
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, field
 
+# Required environment variables mapped to Config fields
+_REQUIRED_ENV_VARS = (
+    ("NEXACRO_USER_ID", "user_id"),
+    ("NEXACRO_USER_PASS", "user_pass"),
+    ("NEXACRO_EMAIL", "email"),
+)
 
-@dataclass
+# Minimal email shape check: local@domain.tld with no whitespace
+_EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+
+# Nexacro XML login request body (credentials filled in once per Config)
+_LOGIN_XML_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<Root xmlns="http://www.nexacroplatform.com/platform/dataset">
+\t<Parameters>
+\t\t<Parameter id="RTYPE">XML</Parameter>
+\t\t<Parameter id="DB">CS</Parameter>
+\t\t<Parameter id="DBUSER">POTAL_USER</Parameter>
+\t</Parameters>
+\t<Dataset id="input">
+\t\t<ColumnInfo>
+\t\t\t<Column id="userId" type="STRING" size="256" />
+\t\t\t<Column id="userPass" type="STRING" size="256" />
+\t\t</ColumnInfo>
+\t\t<Rows>
+\t\t\t<Row>
+\t\t\t\t<Col id="userId">{uid}</Col>
+\t\t\t\t<Col id="userPass">{pw}</Col>
+\t\t\t</Row>
+\t\t</Rows>
+\t</Dataset>
+</Root>"""
+
+
+@dataclass(frozen=True)
 class Config:
-    """Configuration container for license requester."""
+    """
+    Configuration container for license requester.
+
+    Instances are immutable, so the login body derived from the credentials
+    can never go stale; use dataclasses.replace() to change a value.
+    """
 
     user_id: str
     user_pass: str
@@ -30,6 +69,21 @@ class Config:
     request_timeout: int = 30
     max_retries: int = 3
 
+    # Pre-connect to the license host while the portal login is in progress
+    warm_up_connections: bool = True
+
+    # Pre-encoded login POST body, derived from credentials
+    login_body: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Build the login request body once from the credentials."""
+        login_body = _LOGIN_XML_TEMPLATE.format(
+            uid=html.escape(self.user_id, quote=False),
+            pw=html.escape(self.user_pass, quote=False),
+        ).encode("utf-8")
+        # Frozen dataclass: derived fields must bypass __setattr__
+        object.__setattr__(self, "login_body", login_body)
+
     @classmethod
     def from_env(cls) -> "Config":
         """
@@ -41,22 +95,23 @@ class Config:
         Raises:
             ValueError: If required environment variables are missing
         """
-        required_vars = [
-            "NEXACRO_USER_ID",
-            "NEXACRO_USER_PASS",
-            "NEXACRO_EMAIL",
-        ]
+        values: dict[str, str] = {}
+        missing: list[str] = []
+        for var, attr in _REQUIRED_ENV_VARS:
+            value = os.environ.get(var)
+            if value:
+                values[attr] = value
+            else:
+                missing.append(var)
 
-        missing = [var for var in required_vars if not os.getenv(var)]
         if missing:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
 
-        user_id = os.environ["NEXACRO_USER_ID"]
         return cls(
-            user_id=user_id,
-            user_pass=os.environ["NEXACRO_USER_PASS"],
-            customer_id=user_id,
-            email=os.environ["NEXACRO_EMAIL"],
+            user_id=values["user_id"],
+            user_pass=values["user_pass"],
+            customer_id=values["user_id"],
+            email=values["email"],
         )
 
     def validate(self) -> None:
@@ -66,5 +121,5 @@ class Config:
         Raises:
             ValueError: If configuration values are invalid
         """
-        if not self.email or "@" not in self.email:
+        if not _EMAIL_RE.fullmatch(self.email):
             raise ValueError(f"Invalid email format: {self.email}")
@@ -6,8 +6,14 @@ Trace:
   task_id: TASK-006
 """
 
+import atexit
+import functools
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
 from pathlib import Path
 
 from src.config import Config
@@ -18,6 +24,63 @@ from src.session_manager import SessionManager
 LOG_DIR = Path("logs")
 LOG_FILE_NAME = "nexacro_license_request.log"
 
+# Serializes first-time logger configuration across threads
+_logger_lock = threading.Lock()
+
+
+def _get_logger() -> logging.Logger:
+    """
+    Return the shared requester logger, configuring it on first use.
+
+    Returns:
+        logging.Logger: Configured logger instance
+    """
+    with _logger_lock:
+        return _configure_logger()
+
+
+@functools.cache
+def _configure_logger() -> logging.Logger:
+    """
+    Configure structured logging with both file and console handlers.
+
+    Records are pushed onto a queue and written by a background
+    QueueListener, so logging never blocks the workflow on disk or
+    console I/O. Runs once per process.
+
+    Returns:
+        logging.Logger: Configured logger instance
+    """
+    logger = logging.getLogger("NexacroLicenseRequester")
+    logger.setLevel(logging.INFO)
+
+    # Create logs directory if it doesn't exist
+    LOG_DIR.mkdir(exist_ok=True)
+
+    # File handler (reopens the file if it is rotated externally)
+    log_file = LOG_DIR / LOG_FILE_NAME
+    file_handler = WatchedFileHandler(log_file, mode="a", encoding="utf-8")
+    file_handler.setLevel(logging.INFO)
+    file_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    file_handler.setFormatter(file_format)
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    console_handler.setFormatter(console_format)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.listener = listener
+
+    logger.addHandler(queue_handler)
+    return logger
+
 
 class NexacroLicenseRequester:
     """Orchestrates the Nexacro license request workflow."""
@@ -30,40 +93,8 @@ class NexacroLicenseRequester:
             config: Configuration instance with credentials and settings
         """
         self.config = config
-        self.logger = self._setup_logger()
-
-    def _setup_logger(self) -> logging.Logger:
-        """
-        Configure structured logging with both file and console handlers.
-
-        Returns:
-            logging.Logger: Configured logger instance
-        """
-        logger = logging.getLogger("NexacroLicenseRequester")
-        logger.setLevel(logging.INFO)
-
-        # Create logs directory if it doesn't exist
-        LOG_DIR.mkdir(exist_ok=True)
-
-        # File handler
-        log_file = LOG_DIR / LOG_FILE_NAME
-        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-        file_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(file_format)
-
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_format = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        console_handler.setFormatter(console_format)
-
-        # Only add handlers if they don't exist (prevent duplicate handlers)
-        if not logger.handlers:
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
-
-        return logger
+        self.logger = _get_logger()
+        self._trace: list[str] = []
 
     def request_license(self) -> bool:
         """
@@ -72,24 +103,25 @@ class NexacroLicenseRequester:
         Returns:
             bool: True if successful, False otherwise
         """
-        self.logger.info("Starting Nexacro license request workflow")
+        self._trace.clear()
+        self._record("Starting Nexacro license request workflow")
 
         try:
             with SessionManager(self.config) as session:
                 # Step 1: Establish session
-                self.logger.info("Step 1/3: Establishing session")
+                self._record("Step 1/3: Establishing session")
                 cookies = session.establish_session()
-                self.logger.info(f"Session established with {len(cookies)} cookies")
+                self._record(f"Session established with {len(cookies)} cookies")
 
                 # Step 2: Login
-                self.logger.info("Step 2/3: Authenticating")
+                self._record("Step 2/3: Authenticating")
                 session.login()
-                self.logger.info(f"Authentication successful for user: {self.config.user_id}")
+                self._record(f"Authentication successful for user: {self.config.user_id}")
 
                 # Step 3: Request license
-                self.logger.info("Step 3/3: Requesting license")
+                self._record("Step 3/3: Requesting license")
                 session.request_license_email()
-                self.logger.info(f"License request submitted successfully for {self.config.email}")
+                self._record(f"License request submitted successfully for {self.config.email}")
 
             self._log_request_summary(
                 success=True,
@@ -133,12 +165,17 @@ class NexacroLicenseRequester:
         """
         Log structured summary of request outcome.
 
+        The buffered step trace is emitted together with the summary as a
+        single record and then cleared, so a reused requester starts clean.
+
         Args:
             success: Whether the request was successful
             details: Dictionary containing request details
         """
+        trace = "".join(f"{line}\n" for line in self._trace)
         if success:
             self.logger.info(
+                f"{trace}"
                 "=== LICENSE REQUEST SUCCESS ===\n"
                 f"User: {details.get('user_id', 'N/A')}\n"
                 f"Customer: {details.get('customer_id', 'N/A')}\n"
@@ -146,10 +183,21 @@ class NexacroLicenseRequester:
             )
         else:
             self.logger.error(
+                f"{trace}"
                 "=== LICENSE REQUEST FAILED ===\n"
                 f"Error: {details.get('error', 'Unknown')}\n"
                 f"Message: {details.get('message', 'No details')}"
             )
+        self._trace.clear()
+
+    def _record(self, message: str) -> None:
+        """
+        Buffer a workflow step message for the request summary.
+
+        Args:
+            message: Step description to record
+        """
+        self._trace.append(f"{time.monotonic():.3f} {message}")
 
 
 def main() -> int:
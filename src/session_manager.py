@@ -6,15 +6,43 @@ Trace:
   task_id: TASK-005
 """
 
-import requests
+import contextlib
+import re
+import threading
+from collections.abc import Mapping
+from functools import cached_property
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
 from src.config import Config
 from src.exceptions import AuthenticationError, LicenseRequestError, NetworkError
 
+if TYPE_CHECKING:
+    from requests.cookies import RequestsCookieJar
+
+# Headers for the XML login POST (shared across calls)
+LOGIN_HEADERS = {"Content-Type": "text/xml; charset=UTF-8"}
+
+# Connection pool and transport-level retry settings
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 4
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_FORCELIST = (502, 503, 504)
+
+# Hard deadline (seconds) for the single background license-host warm-up
+# request; the workflow waits slightly longer before using or closing the pool
+WARM_UP_TIMEOUT = 5.0
+WARM_UP_JOIN_TIMEOUT = WARM_UP_TIMEOUT + 1.0
+
 
 class SessionManager:
     """Manages session lifecycle for TOBESOFT support portal."""
 
+    # Response result sentinels, matched case-insensitively on raw bytes
+    _SUCCESS_RE = re.compile(rb"SUCCESS", re.IGNORECASE)
+    _FAIL_RE = re.compile(rb"FAIL", re.IGNORECASE)
+
     def __init__(self, config: Config):
         """
         Initialize session manager with configuration.
@@ -22,36 +50,92 @@ class SessionManager:
         Args:
             config: Configuration instance with credentials and URLs
         """
+        # requests is imported lazily so CLI startup (and config validation
+        # failures) don't pay for loading requests/urllib3
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.config = config
-        self.session = requests.Session()
+        self.session: requests.Session = requests.Session()
         self.session.headers.update(
             {"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"}
         )
 
-    def establish_session(self) -> dict[str, str]:
+        # Keep-alive connection pool with transparent retries for transient
+        # failures. Read errors are never retried: the server may already have
+        # acted on the request, and a read timeout must surface as Timeout.
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=config.max_retries,
+                connect=config.max_retries,
+                read=False,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+                status_forcelist=RETRY_STATUS_FORCELIST,
+                # A server-chosen Retry-After (capped only at hours) must not
+                # stall the run; keep the bounded backoff instead
+                respect_retry_after_header=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # The license GET sends an email, so it is only retried when the
+        # connection could not be opened, never because of a response status
+        license_adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=Retry(
+                total=config.max_retries,
+                connect=config.max_retries,
+                read=False,
+                respect_retry_after_header=False,
+                backoff_factor=RETRY_BACKOFF_FACTOR,
+            ),
+        )
+        license_origin = urlsplit(config.license_url)
+        self.session.mount(f"{license_origin.scheme}://{license_origin.netloc}/", license_adapter)
+
+        # Single-try adapter sharing the license pool, used only for the
+        # warm-up so it never retries in the background
+        self._warm_up_adapter = HTTPAdapter(max_retries=0)
+        self._warm_up_adapter.poolmanager = license_adapter.poolmanager
+
+        self._warm_up_thread: threading.Thread | None = None
+
+    def establish_session(self) -> "RequestsCookieJar":
         """
         Retrieve initial session cookies from homepage.
 
         Returns:
-            Dict mapping cookie names to values
+            Cookie jar received from the homepage (also merged into the session)
 
         Raises:
             NetworkError: If homepage is unreachable or request fails
         """
+        import requests
+
+        # The license host differs from the portal host; open its TLS
+        # connection in the background while homepage and login run
+        if self.config.warm_up_connections:
+            self._warm_up_thread = threading.Thread(target=self._warm_up_license_host, daemon=True)
+            self._warm_up_thread.start()
+
         try:
             response = self.session.get(
                 self.config.homepage_url, timeout=self.config.request_timeout
             )
             response.raise_for_status()
 
-            # Convert cookies to dictionary
-            return dict(response.cookies.items())
+            return response.cookies
 
         except requests.exceptions.Timeout as e:
             raise NetworkError(f"Request timeout: {self.config.homepage_url}") from e
         except requests.exceptions.ConnectionError as e:
             raise NetworkError(f"Connection failed: {self.config.homepage_url}") from e
-        except requests.exceptions.HTTPError as e:
+        except (requests.exceptions.HTTPError, requests.exceptions.RetryError) as e:
             raise NetworkError(f"HTTP error: {e}") from e
 
     def login(self) -> bool:
@@ -65,19 +149,19 @@ class SessionManager:
             AuthenticationError: If login fails
             NetworkError: If network request fails
         """
-        xml_body = self._build_login_xml()
+        import requests
 
         try:
             response = self.session.post(
                 self.config.login_url,
-                data=xml_body,
-                headers={"Content-Type": "text/xml; charset=UTF-8"},
+                data=self.config.login_body,
+                headers=LOGIN_HEADERS,
                 timeout=self.config.request_timeout,
             )
             response.raise_for_status()
 
-            # Check if login was successful
-            if "SUCCESS" in response.text.upper():
+            # Check if login was successful (byte scan, no decode of the body)
+            if self._SUCCESS_RE.search(response.content):
                 return True
             else:
                 raise AuthenticationError("Login failed: Invalid credentials or response")
@@ -86,7 +170,7 @@ class SessionManager:
             raise NetworkError("Request timeout during login") from e
         except requests.exceptions.ConnectionError as e:
             raise NetworkError("Connection failed during login") from e
-        except requests.exceptions.HTTPError as e:
+        except (requests.exceptions.HTTPError, requests.exceptions.RetryError) as e:
             raise NetworkError(f"HTTP error during login: {e}") from e
 
     def request_license_email(self) -> bool:
@@ -100,18 +184,23 @@ class SessionManager:
             LicenseRequestError: If request submission fails
             NetworkError: If network request fails
         """
-        params = self._build_license_params()
+        import requests
+
+        self._wait_for_warm_up()
 
         try:
             response = self.session.get(
-                self.config.license_url, params=params, timeout=self.config.request_timeout
+                self.config.license_url,
+                params=self._license_params,
+                timeout=self.config.request_timeout,
             )
             response.raise_for_status()
 
-            # Check if request was successful
-            if "FAIL" in response.text.upper():
+            # Check if request was successful (byte scan, no decode of the body)
+            body = response.content
+            if self._FAIL_RE.search(body):
                 raise LicenseRequestError("License request failed")
-            elif "SUCCESS" in response.text.upper():
+            elif self._SUCCESS_RE.search(body):
                 return True
             else:
                 raise LicenseRequestError("License request failed: Unknown response")
@@ -120,64 +209,79 @@ class SessionManager:
             raise NetworkError("Request timeout during license request") from e
         except requests.exceptions.ConnectionError as e:
             raise NetworkError("Connection failed during license request") from e
-        except requests.exceptions.HTTPError as e:
+        except (requests.exceptions.HTTPError, requests.exceptions.RetryError) as e:
             raise NetworkError(f"HTTP error during license request: {e}") from e
 
-    def _build_login_xml(self) -> str:
+    @cached_property
+    def _license_params(self) -> Mapping[str, str]:
         """
-        Construct XML body for login POST request.
+        Query parameters for license request, built once per session manager.
+
+        The mapping is read-only so the cached instance can be safely reused
+        across calls.
 
         Returns:
-            str: XML formatted login request body
+            Read-only mapping of parameter names to values
         """
-        xml = f"""<?xml version="1.0" encoding="UTF-8"?>
-<Root xmlns="http://www.nexacroplatform.com/platform/dataset">
-\t<Parameters>
-\t\t<Parameter id="RTYPE">XML</Parameter>
-\t\t<Parameter id="DB">CS</Parameter>
-\t\t<Parameter id="DBUSER">POTAL_USER</Parameter>
-\t</Parameters>
-\t<Dataset id="input">
-\t\t<ColumnInfo>
-\t\t\t<Column id="userId" type="STRING" size="256" />
-\t\t\t<Column id="userPass" type="STRING" size="256" />
-\t\t</ColumnInfo>
-\t\t<Rows>
-\t\t\t<Row>
-\t\t\t\t<Col id="userId">{self.config.user_id}</Col>
-\t\t\t\t<Col id="userPass">{self.config.user_pass}</Col>
-\t\t\t</Row>
-\t\t</Rows>
-\t</Dataset>
-</Root>"""
-        return xml
-
-    def _build_license_params(self) -> dict[str, str]:
+        return MappingProxyType(
+            {
+                "service": "xupservice",
+                "domain": "NEXTp",
+                "model": "CE_LicenseEMailSend_R01",
+                "format": "xml",
+                "version": "xplatform",
+                "p_ConType": "TECH2",
+                "p_Product": "NP14",
+                "p_Language": "KOR",
+                "p_CustomID": self.config.customer_id,
+                "p_Email": self.config.email,
+                "p_Merge": "N",
+                "zip": "false",
+            }
+        )
+
+    def _warm_up_license_host(self) -> None:
         """
-        Construct query parameters for license request.
+        Prime a keep-alive connection to the license host in the session pool.
 
-        Returns:
-            Dict mapping parameter names to values
+        The HEAD is sent once through the warm-up adapter with a total
+        deadline of WARM_UP_TIMEOUT, so it always finishes within
+        _wait_for_warm_up(). Best effort: failures are ignored,
+        request_license_email() reports any real connectivity problem.
         """
-        return {
-            "service": "xupservice",
-            "domain": "NEXTp",
-            "model": "CE_LicenseEMailSend_R01",
-            "format": "xml",
-            "version": "xplatform",
-            "p_ConType": "TECH2",
-            "p_Product": "NP14",
-            "p_Language": "KOR",
-            "p_CustomID": self.config.customer_id,
-            "p_Email": self.config.email,
-            "p_Merge": "N",
-            "zip": "false",
-        }
+        import requests
+        from urllib3.util.timeout import Timeout
+
+        with contextlib.suppress(requests.exceptions.RequestException):
+            request = self.session.prepare_request(
+                requests.Request("HEAD", self.config.license_url)
+            )
+            # Same proxy/TLS settings as Session.request, so the same pool is primed
+            settings = self.session.merge_environment_settings(
+                self.config.license_url, {}, None, None, None
+            )
+            # HTTPAdapter.send accepts a urllib3 Timeout as-is (not in its type
+            # hints); total= bounds connect and read together
+            deadline = Timeout(total=WARM_UP_TIMEOUT)
+            response = self._warm_up_adapter.send(
+                request,
+                timeout=deadline,  # pyright: ignore[reportArgumentType]
+                **settings,
+            )
+            # Drain the (empty) body so the connection is returned to the pool
+            # rather than closed
+            _ = response.content
+
+    def _wait_for_warm_up(self) -> None:
+        """Wait, at most WARM_UP_JOIN_TIMEOUT seconds, for the warm-up request to finish."""
+        if self._warm_up_thread is not None:
+            self._warm_up_thread.join(WARM_UP_JOIN_TIMEOUT)
 
     def __enter__(self):
         """Context manager entry."""
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit - close session."""
+        """Context manager exit - close session once the warm-up is done with it."""
+        self._wait_for_warm_up()
         self.session.close()
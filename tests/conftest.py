@@ -0,0 +1,132 @@
+"""
+Shared pytest fixtures.
+
+Trace:
+  spec_id: SPEC-license-request-001
+  task_id: TASK-001
+"""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import src.nexacro_license_requester as nexacro_license_requester
+from src.config import Config
+from tests.portal_responses import XML_OK
+
+
+def pytest_addoption(parser):
+    """Register the opt-in flag for tests that hit the live portal."""
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests marked 'network' that require live HTTP access",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip 'network' tests unless --run-network is given, keeping the suite hermetic."""
+    if config.getoption("--run-network"):
+        return
+
+    skip_network = pytest.mark.skip(reason="needs --run-network option to run")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_log_dir(tmp_path_factory):
+    """Redirect the requester log file to a temporary directory (per xdist worker)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(nexacro_license_requester, "LOG_DIR", tmp_path_factory.mktemp("logs"))
+        yield
+
+
+@pytest.fixture(scope="session")
+def mock_config():
+    """Fixture providing test configuration (shared, never mutated by tests)."""
+    return Config(
+        user_id="test_user",
+        user_pass="test_pass",
+        customer_id="test_customer",
+        email="test@example.com",
+        warm_up_connections=False,
+    )
+
+
+@pytest.fixture
+def valid_env(monkeypatch):
+    """Fixture setting all required NEXACRO_* environment variables."""
+    for var, value in (
+        ("NEXACRO_USER_ID", "test_user"),
+        ("NEXACRO_USER_PASS", "test_pass"),
+        ("NEXACRO_EMAIL", "test@example.com"),
+    ):
+        monkeypatch.setenv(var, value)
+
+
+class _StubPortalHandler(BaseHTTPRequestHandler):
+    """
+    Loopback stand-in for the portal and license hosts.
+
+    /stall never answers, /unavailable is a 503 carrying Retry-After, and
+    any other path succeeds. Keep-alive is enabled so tests can count how
+    many connections the client opened.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        path = self.path.split("?", 1)[0]
+        self.server.hits[path] += 1
+        if path == "/stall":
+            # Outlive the client's read timeout, then drop the connection
+            time.sleep(1.0)
+            self.close_connection = True
+            return
+
+        if path == "/unavailable":
+            self.send_response(503)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            body = b""
+        else:
+            self.send_response(200)
+            body = XML_OK
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Fixture providing a local HTTP server, so requests go through the real adapters."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubPortalHandler)
+    server.daemon_threads = True
+    server.hits = Counter()
+    server.connections = 0
+    # Retry-After (seconds) sent with 503s; retries must not honour it
+    server.retry_after = 5
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
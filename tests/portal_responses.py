@@ -0,0 +1,11 @@
+"""
+Canned TOBESOFT portal response bodies shared by the test modules.
+
+Trace:
+  spec_id: SPEC-license-request-001
+  task_id: TASK-005
+"""
+
+# Bytes, because SessionManager matches the result sentinel on response.content
+XML_OK = b'<?xml version="1.0"?><Root><Result>SUCCESS</Result></Root>'
+XML_FAIL = b'<?xml version="1.0"?><Root><Result>FAIL</Result></Root>'
@@ -6,20 +6,21 @@ Trace:
   task_id: TASK-004
 """
 
+import xml.etree.ElementTree as ET
+from dataclasses import FrozenInstanceError, replace
+
 import pytest
 
 from src.config import Config
 
+NEXACRO_NS = "http://www.nexacroplatform.com/platform/dataset"
+
 
 class TestConfigFromEnv:
     """Tests for Config.from_env() class method."""
 
-    def test_from_env_with_all_variables(self, monkeypatch):
+    def test_from_env_with_all_variables(self, valid_env):
         """Test successful config creation when all env vars are set."""
-        monkeypatch.setenv("NEXACRO_USER_ID", "test_user")
-        monkeypatch.setenv("NEXACRO_USER_PASS", "test_pass")
-        monkeypatch.setenv("NEXACRO_EMAIL", "test@example.com")
-
         config = Config.from_env()
 
         assert config.user_id == "test_user"
@@ -90,6 +91,30 @@ class TestConfigValidation:
         with pytest.raises(ValueError, match="Invalid email"):
             config.validate()
 
+    def test_validate_invalid_email_no_domain_dot(self):
+        """Test validation fails when email domain has no dot."""
+        config = Config(
+            user_id="test_user",
+            user_pass="test_pass",
+            customer_id="test_customer",
+            email="test@localhost",
+        )
+
+        with pytest.raises(ValueError, match="Invalid email"):
+            config.validate()
+
+    def test_validate_invalid_email_whitespace(self):
+        """Test validation fails when email contains whitespace."""
+        config = Config(
+            user_id="test_user",
+            user_pass="test_pass",
+            customer_id="test_customer",
+            email="test user@example.com",
+        )
+
+        with pytest.raises(ValueError, match="Invalid email"):
+            config.validate()
+
     def test_validate_empty_email(self):
         """Test validation fails with empty email."""
         config = Config(
@@ -130,3 +155,67 @@ class TestConfigDefaults:
 
         assert config.request_timeout == 30
         assert config.max_retries == 3
+        assert config.warm_up_connections is True
+
+
+class TestConfigLoginBody:
+    """Tests for the pre-built login request body."""
+
+    def test_login_body(self):
+        """Test XML body construction for login."""
+        config = Config(
+            user_id="test_user",
+            user_pass="test_pass",
+            customer_id="test_customer",
+            email="test@example.com",
+        )
+        root = ET.fromstring(config.login_body)
+
+        assert config.login_body.startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+        assert root.tag == f"{{{NEXACRO_NS}}}Root"
+        params = {p.get("id"): p.text for p in root.iter(f"{{{NEXACRO_NS}}}Parameter")}
+        assert params == {"RTYPE": "XML", "DB": "CS", "DBUSER": "POTAL_USER"}
+        dataset = root.find(f"{{{NEXACRO_NS}}}Dataset")
+        assert dataset is not None
+        assert dataset.get("id") == "input"
+        cols = {c.get("id"): c.text for c in dataset.iter(f"{{{NEXACRO_NS}}}Col")}
+        assert cols == {"userId": "test_user", "userPass": "test_pass"}
+
+    def test_login_body_escapes_credentials(self):
+        """Test that XML special characters in credentials are escaped."""
+        config = Config(
+            user_id="test_user",
+            user_pass="p<a>ss&word",
+            customer_id="test_customer",
+            email="test@example.com",
+        )
+
+        assert b'<Col id="userPass">p&lt;a&gt;ss&amp;word</Col>' in config.login_body
+        cols = {
+            c.get("id"): c.text
+            for c in ET.fromstring(config.login_body).iter(f"{{{NEXACRO_NS}}}Col")
+        }
+        assert cols["userPass"] == "p<a>ss&word"
+
+    def test_credentials_cannot_change_after_construction(self, mock_config):
+        """Test that credentials are immutable, so login_body cannot go stale."""
+        with pytest.raises(FrozenInstanceError):
+            mock_config.user_pass = "other_pass"
+
+    def test_replace_rebuilds_login_body(self, mock_config):
+        """Test that a replaced config derives its login body from the new credentials."""
+        config = replace(mock_config, user_pass="other_pass")
+
+        assert b"other_pass" in config.login_body
+        assert b"test_pass" not in config.login_body
+
+    def test_login_body_not_in_repr(self):
+        """Test that the credential-bearing login body is excluded from repr."""
+        config = Config(
+            user_id="test_user",
+            user_pass="test_pass",
+            customer_id="test_customer",
+            email="test@example.com",
+        )
+
+        assert "login_body" not in repr(config)
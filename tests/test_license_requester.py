@@ -8,86 +8,115 @@ Trace:
 """
 
 import logging
-from unittest.mock import Mock, patch
+import subprocess
+import sys
+from logging.handlers import QueueHandler, WatchedFileHandler
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
 
 import pytest
 
-from src.config import Config
 from src.exceptions import AuthenticationError, LicenseRequestError, NetworkError
-from src.nexacro_license_requester import NexacroLicenseRequester
+from src.nexacro_license_requester import NexacroLicenseRequester, main
+from src.session_manager import SessionManager
 
 
-@pytest.fixture
-def mock_config():
-    """Fixture providing test configuration."""
-    return Config(
-        user_id="test_user",
-        user_pass="test_pass",
-        customer_id="test_customer",
-        email="test@example.com",
-    )
+@pytest.fixture(scope="session")
+def license_requester(mock_config):
+    """Fixture providing a NexacroLicenseRequester instance shared across tests."""
+    return NexacroLicenseRequester(mock_config)
+
+
+def _mk_session(**behaviors):
+    """Build a spec'd mock session, raising exception behaviors and returning the rest."""
+    session = MagicMock(spec=SessionManager)
+    for name, value in behaviors.items():
+        attr = "side_effect" if isinstance(value, Exception) else "return_value"
+        setattr(getattr(session, name), attr, value)
+    return session
 
 
 @pytest.fixture
-def license_requester(mock_config):
-    """Fixture providing NexacroLicenseRequester instance."""
-    return NexacroLicenseRequester(mock_config)
+def session_cm(monkeypatch):
+    """Fixture replacing SessionManager with a context manager yielding a mock session."""
+    session_cm = MagicMock()
+    session_cm.__enter__.return_value = _mk_session(
+        establish_session={"JSESSIONID": "test"}, login=True, request_license_email=True
+    )
+    monkeypatch.setattr(
+        "src.nexacro_license_requester.SessionManager", lambda *args, **kwargs: session_cm
+    )
+    return session_cm
 
 
 class TestLicenseRequester:
     """Tests for main orchestrator functionality"""
 
-    def test_request_license_success(self, license_requester):
-        """Test successful full workflow execution."""
-        with patch("src.nexacro_license_requester.SessionManager") as MockSessionManager:
-            mock_session = Mock()
-            mock_session.establish_session.return_value = {"JSESSIONID": "test"}
-            mock_session.login.return_value = True
-            mock_session.request_license_email.return_value = True
-            MockSessionManager.return_value.__enter__.return_value = mock_session
-
-            result = license_requester.request_license()
-
-            assert result is True
-            mock_session.establish_session.assert_called_once()
+    @pytest.mark.parametrize(
+        ("behaviors", "expected"),
+        [
+            pytest.param(
+                {
+                    "establish_session": {"JSESSIONID": "test"},
+                    "login": True,
+                    "request_license_email": True,
+                },
+                True,
+                id="success",
+            ),
+            pytest.param(
+                {"establish_session": NetworkError("Session failed")},
+                False,
+                id="session-failure",
+            ),
+            pytest.param(
+                {
+                    "establish_session": {"JSESSIONID": "test"},
+                    "login": AuthenticationError("Login failed"),
+                },
+                False,
+                id="login-failure",
+            ),
+            pytest.param(
+                {
+                    "establish_session": {"JSESSIONID": "test"},
+                    "login": True,
+                    "request_license_email": LicenseRequestError("Request failed"),
+                },
+                False,
+                id="request-failure",
+            ),
+        ],
+    )
+    def test_request_license_outcome(self, license_requester, session_cm, behaviors, expected):
+        """Test workflow result when each step succeeds or fails."""
+        mock_session = _mk_session(**behaviors)
+        session_cm.__enter__.return_value = mock_session
+
+        assert license_requester.request_license() is expected
+        mock_session.establish_session.assert_called_once()
+        if expected:
             mock_session.login.assert_called_once()
             mock_session.request_license_email.assert_called_once()
 
-    def test_request_license_session_failure(self, license_requester):
-        """Test workflow handles session establishment failure."""
-        with patch("src.nexacro_license_requester.SessionManager") as MockSessionManager:
-            mock_session = Mock()
-            mock_session.establish_session.side_effect = NetworkError("Session failed")
-            MockSessionManager.return_value.__enter__.return_value = mock_session
-
-            result = license_requester.request_license()
-
-            assert result is False
+    def test_request_license_closes_session_on_success(self, license_requester, session_cm):
+        """Test that the session context is exited after a successful workflow."""
+        assert license_requester.request_license() is True
 
-    def test_request_license_login_failure(self, license_requester):
-        """Test workflow handles login failure."""
-        with patch("src.nexacro_license_requester.SessionManager") as MockSessionManager:
-            mock_session = Mock()
-            mock_session.establish_session.return_value = {"JSESSIONID": "test"}
-            mock_session.login.side_effect = AuthenticationError("Login failed")
-            MockSessionManager.return_value.__enter__.return_value = mock_session
+        session_cm.__exit__.assert_called_once()
+        assert session_cm.__exit__.call_args.args == (None, None, None)
 
-            result = license_requester.request_license()
-
-            assert result is False
-
-    def test_request_license_request_failure(self, license_requester):
-        """Test workflow handles license request failure."""
-        with patch("src.nexacro_license_requester.SessionManager") as MockSessionManager:
-            mock_session = Mock()
-            mock_session.establish_session.return_value = {"JSESSIONID": "test"}
-            mock_session.login.return_value = True
-            mock_session.request_license_email.side_effect = LicenseRequestError("Request failed")
-            MockSessionManager.return_value.__enter__.return_value = mock_session
+    def test_request_license_closes_session_on_failure(self, license_requester, session_cm):
+        """Test that the session context is exited when a workflow step fails."""
+        session_cm.__enter__.return_value = _mk_session(
+            establish_session={"JSESSIONID": "test"},
+            login=AuthenticationError("Login failed"),
+        )
 
-            result = license_requester.request_license()
+        assert license_requester.request_license() is False
 
-            assert result is False
+        session_cm.__exit__.assert_called_once()
+        assert session_cm.__exit__.call_args.args[0] is AuthenticationError
 
 
 class TestLogging:
@@ -98,56 +127,97 @@ class TestLogging:
         assert license_requester.logger is not None
         assert license_requester.logger.name == "NexacroLicenseRequester"
 
+    def test_logger_uses_queue_handler(self, license_requester):
+        """Test that logger hands records off to a queue instead of writing directly."""
+        assert [type(h) for h in license_requester.logger.handlers] == [QueueHandler]
+
     def test_logger_has_console_handler(self, license_requester):
         """Test that logger has console handler configured."""
-        assert any(
-            isinstance(h, logging.StreamHandler) for h in license_requester.logger.handlers
-        ), "Logger should have at least one console handler"
+        listener = license_requester.logger.handlers[0].listener
+        assert listener is not None
+        assert any(isinstance(h, logging.StreamHandler) for h in listener.handlers), (
+            "Logger should have at least one console handler"
+        )
 
     def test_logger_has_file_handler(self, license_requester):
         """Test that logger has file handler configured (P2 bug fix)."""
-        assert any(isinstance(h, logging.FileHandler) for h in license_requester.logger.handlers), (
+        listener = license_requester.logger.handlers[0].listener
+        assert listener is not None
+        assert any(isinstance(h, logging.FileHandler) for h in listener.handlers), (
             "Logger should have file handler as documented"
         )
 
-    def test_log_request_summary_success(self, license_requester):
+    def test_logger_configured_once_for_multiple_instances(self, mock_config):
+        """Test that repeated instantiation reuses the logger without duplicate handlers."""
+        requester1 = NexacroLicenseRequester(mock_config)
+        requester2 = NexacroLicenseRequester(mock_config)
+
+        assert requester1.logger is requester2.logger
+        assert len(requester2.logger.handlers) == 1
+
+    def test_file_handler_follows_rotation(self, license_requester):
+        """Test that file handler reopens the log file after external rotation."""
+        listener = license_requester.logger.handlers[0].listener
+        handler = next(h for h in listener.handlers if isinstance(h, WatchedFileHandler))
+        log_file = Path(handler.baseFilename)
+        log_file.rename(log_file.with_name(f"{log_file.name}.1"))
+
+        handler.handle(
+            logging.makeLogRecord(
+                {"msg": "after rotation", "levelno": logging.INFO, "levelname": "INFO"}
+            )
+        )
+
+        assert log_file.exists()
+        assert "after rotation" in log_file.read_text(encoding="utf-8")
+
+    def test_log_request_summary_success(self, license_requester, mocker):
         """Test logging of successful request summary."""
-        with patch.object(license_requester.logger, "info") as mock_info:
-            license_requester._log_request_summary(success=True, details={"step": "completed"})
+        mock_info = mocker.patch.object(license_requester.logger, "info")
+        license_requester._log_request_summary(success=True, details={"step": "completed"})
+
+        mock_info.assert_called_once()
+        message = mock_info.call_args.args[0]
+        assert "SUCCESS" in message or "success" in message
+
+    def test_request_license_emits_single_info_record(self, license_requester, session_cm, mocker):
+        """Test that step trace is buffered and logged once with the summary."""
+        mock_info = mocker.patch.object(license_requester.logger, "info")
+        license_requester.request_license()
+
+        mock_info.assert_called_once()
+        message = mock_info.call_args.args[0]
+        assert "Step 1/3: Establishing session" in message
+        assert "Step 3/3: Requesting license" in message
+        assert message.endswith("Email: test@example.com")
 
-            mock_info.assert_called_once()
-            call_args = str(mock_info.call_args)
-            assert "SUCCESS" in call_args or "success" in call_args
+    def test_request_license_clears_trace_after_summary(self, license_requester, session_cm):
+        """Test that a reused requester does not carry the step trace between runs."""
+        license_requester.request_license()
 
-    def test_log_request_summary_failure(self, license_requester):
+        assert license_requester._trace == []
+
+    def test_log_request_summary_failure(self, license_requester, mocker):
         """Test logging of failed request summary."""
-        with patch.object(license_requester.logger, "error") as mock_error:
-            license_requester._log_request_summary(
-                success=False, details={"error": "Network timeout"}
-            )
+        mock_error = mocker.patch.object(license_requester.logger, "error")
+        license_requester._log_request_summary(success=False, details={"error": "Network timeout"})
 
-            mock_error.assert_called_once()
+        mock_error.assert_called_once()
 
 
 class TestMainEntryPoint:
     """Tests for main() entry point"""
 
-    def test_main_with_valid_env(self, monkeypatch):
+    def test_main_with_valid_env(self, valid_env, mocker):
         """Test main() executes successfully with valid environment."""
-        monkeypatch.setenv("NEXACRO_USER_ID", "test_user")
-        monkeypatch.setenv("NEXACRO_USER_PASS", "test_pass")
-        monkeypatch.setenv("NEXACRO_EMAIL", "test@example.com")
-
-        with patch("src.nexacro_license_requester.NexacroLicenseRequester") as MockRequester:
-            mock_instance = Mock()
-            mock_instance.request_license.return_value = True
-            MockRequester.return_value = mock_instance
+        MockRequester = mocker.patch("src.nexacro_license_requester.NexacroLicenseRequester")
+        mock_instance = Mock()
+        mock_instance.request_license.return_value = True
+        MockRequester.return_value = mock_instance
 
-            from src.nexacro_license_requester import main
-
-            # Should not raise and should return 0
-            result = main()
-            assert result == 0
+        # Should not raise and should return 0
+        result = main()
+        assert result == 0
 
     def test_main_with_missing_env(self, monkeypatch):
         """Test main() handles missing environment variables."""
@@ -155,24 +225,33 @@ class TestMainEntryPoint:
         for var in ["NEXACRO_USER_ID", "NEXACRO_USER_PASS", "NEXACRO_EMAIL"]:
             monkeypatch.delenv(var, raising=False)
 
-        from src.nexacro_license_requester import main
-
         # Should return non-zero exit code
         result = main()
         assert result != 0
 
-    def test_main_with_request_failure(self, monkeypatch):
+    def test_main_with_request_failure(self, valid_env, mocker):
         """Test main() handles request failure."""
-        monkeypatch.setenv("NEXACRO_USER_ID", "test_user")
-        monkeypatch.setenv("NEXACRO_USER_PASS", "test_pass")
-        monkeypatch.setenv("NEXACRO_EMAIL", "test@example.com")
-
-        with patch("src.nexacro_license_requester.NexacroLicenseRequester") as MockRequester:
-            mock_instance = Mock()
-            mock_instance.request_license.return_value = False
-            MockRequester.return_value = mock_instance
+        MockRequester = mocker.patch("src.nexacro_license_requester.NexacroLicenseRequester")
+        mock_instance = Mock()
+        mock_instance.request_license.return_value = False
+        MockRequester.return_value = mock_instance
 
-            from src.nexacro_license_requester import main
+        result = main()
+        assert result == 1
+
+    def test_import_defers_requests(self):
+        """Test that importing the entry point does not load requests or the HTTP/TLS stack."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, src.nexacro_license_requester; "
+                "print(sorted({'requests', 'http.client', 'ssl'} & sys.modules.keys()))",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parents[1],
+        )
 
-            result = main()
-            assert result == 1
+        assert result.stdout.strip() == "[]"
@@ -7,25 +7,17 @@ Trace:
   test_refs: TEST-license-request-001, TEST-license-request-002, TEST-license-request-003
 """
 
-from unittest.mock import Mock, patch
+import threading
+import time
+from dataclasses import replace
 
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
-from src.config import Config
 from src.exceptions import AuthenticationError, LicenseRequestError, NetworkError
-from src.session_manager import SessionManager
-
-
-@pytest.fixture
-def mock_config():
-    """Fixture providing test configuration."""
-    return Config(
-        user_id="test_user",
-        user_pass="test_pass",
-        customer_id="test_customer",
-        email="test@example.com",
-    )
+from src.session_manager import POOL_CONNECTIONS, POOL_MAXSIZE, WARM_UP_TIMEOUT, SessionManager
+from tests.portal_responses import XML_FAIL, XML_OK
 
 
 @pytest.fixture
@@ -37,198 +29,237 @@ def session_manager(mock_config):
 class TestSessionEstablishment:
     """Tests for session establishment (TEST-license-request-001)"""
 
-    def test_establish_session_success(self, session_manager):
+    def test_establish_session_success(self, session_manager, requests_mock):
         """Test successful session cookie retrieval."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.cookies = {"JSESSIONID": "test_session_id", "OTHER": "value"}
-            mock_get.return_value = mock_response
-
-            cookies = session_manager.establish_session()
-
-            assert "JSESSIONID" in cookies
-            assert cookies["JSESSIONID"] == "test_session_id"
-            mock_get.assert_called_once_with(
-                session_manager.config.homepage_url, timeout=session_manager.config.request_timeout
-            )
-
-    def test_establish_session_network_error(self, session_manager):
+        requests_mock.get(
+            session_manager.config.homepage_url,
+            cookies={"JSESSIONID": "test_session_id", "OTHER": "value"},
+        )
+
+        cookies = session_manager.establish_session()
+
+        assert "JSESSIONID" in cookies
+        assert cookies["JSESSIONID"] == "test_session_id"
+        assert requests_mock.call_count == 1
+        assert requests_mock.last_request.timeout == session_manager.config.request_timeout
+
+    def test_establish_session_warms_up_license_host(self, mock_config, stub_server, requests_mock):
+        """Test that the license host connection is primed in the background."""
+        license_url = f"http://127.0.0.1:{stub_server.server_port}/license"
+        session_manager = SessionManager(
+            replace(mock_config, warm_up_connections=True, license_url=license_url)
+        )
+        requests_mock.get(mock_config.homepage_url)
+
+        session_manager.establish_session()
+        session_manager._warm_up_thread.join()
+
+        assert stub_server.hits["/license"] == 1
+
+    def test_warm_up_connection_reused_by_license_request(self, mock_config, stub_server):
+        """Test that the warm-up leaves a pooled connection for the license GET."""
+        license_url = f"http://127.0.0.1:{stub_server.server_port}/license"
+        session_manager = SessionManager(replace(mock_config, license_url=license_url))
+
+        session_manager._warm_up_license_host()
+
+        assert session_manager.request_license_email() is True
+        assert stub_server.hits["/license"] == 2
+        assert stub_server.connections == 1
+
+    def test_establish_session_ignores_warm_up_failure(
+        self, mock_config, stub_server, requests_mock, monkeypatch
+    ):
+        """Test that a stalled warm-up is tried once, bounded, and does not fail the step."""
+        monkeypatch.setattr("src.session_manager.WARM_UP_TIMEOUT", 0.2)
+        license_url = f"http://127.0.0.1:{stub_server.server_port}/stall"
+        session_manager = SessionManager(
+            replace(mock_config, warm_up_connections=True, license_url=license_url)
+        )
+        requests_mock.get(mock_config.homepage_url, cookies={"JSESSIONID": "test_session_id"})
+
+        start = time.monotonic()
+        cookies = session_manager.establish_session()
+        session_manager._warm_up_thread.join()
+
+        assert cookies["JSESSIONID"] == "test_session_id"
+        assert stub_server.hits["/stall"] == 1
+        assert time.monotonic() - start < 1.0
+
+    def test_establish_session_network_error(self, session_manager, requests_mock):
         """Test handling of network errors during session establishment."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError()
+        requests_mock.get(
+            session_manager.config.homepage_url, exc=requests.exceptions.ConnectionError
+        )
 
-            with pytest.raises(NetworkError):
-                session_manager.establish_session()
+        with pytest.raises(NetworkError):
+            session_manager.establish_session()
 
-    def test_establish_session_timeout(self, session_manager):
+    def test_establish_session_timeout(self, session_manager, requests_mock):
         """Test handling of timeout during session establishment."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_get.side_effect = requests.exceptions.Timeout()
+        requests_mock.get(session_manager.config.homepage_url, exc=requests.exceptions.Timeout)
+
+        with pytest.raises(NetworkError, match="timeout"):
+            session_manager.establish_session()
+
+    def test_establish_session_retries_exhausted(self, session_manager, requests_mock):
+        """Test that exhausted status retries are reported as an HTTP error."""
+        requests_mock.get(session_manager.config.homepage_url, exc=requests.exceptions.RetryError)
 
-            with pytest.raises(NetworkError, match="timeout"):
-                session_manager.establish_session()
+        with pytest.raises(NetworkError, match="^HTTP error"):
+            session_manager.establish_session()
 
-    def test_establish_session_http_error(self, session_manager):
+    def test_establish_session_http_error(self, session_manager, requests_mock):
         """Test handling of HTTP errors during session establishment."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError()
-            mock_get.return_value = mock_response
+        requests_mock.get(session_manager.config.homepage_url, status_code=500)
 
-            with pytest.raises(NetworkError):
-                session_manager.establish_session()
+        with pytest.raises(NetworkError):
+            session_manager.establish_session()
 
 
 class TestAuthentication:
     """Tests for login functionality (TEST-license-request-002)"""
 
-    def test_login_success(self, session_manager):
+    def test_login_success(self, session_manager, requests_mock):
         """Test successful authentication."""
-        with patch.object(session_manager.session, "post") as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = '<?xml version="1.0"?><Root><Result>SUCCESS</Result></Root>'
-            mock_post.return_value = mock_response
+        requests_mock.post(
+            session_manager.config.login_url,
+            content=XML_OK,
+        )
 
-            result = session_manager.login()
+        result = session_manager.login()
 
-            assert result is True
-            assert mock_post.call_count == 1
+        assert result is True
+        assert requests_mock.call_count == 1
 
-            # Verify XML body was sent
-            call_args = mock_post.call_args
-            assert "data" in call_args.kwargs
-            xml_body = call_args.kwargs["data"]
-            assert "test_user" in xml_body
-            assert "test_pass" in xml_body
+        # Verify XML body was sent
+        request = requests_mock.last_request
+        assert request.headers["Content-Type"] == "text/xml; charset=UTF-8"
+        assert request.body == session_manager.config.login_body
+        assert b"test_user" in request.body
+        assert b"test_pass" in request.body
 
-    def test_login_authentication_failure(self, session_manager):
-        """Test authentication failure with invalid credentials."""
-        with patch.object(session_manager.session, "post") as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = '<?xml version="1.0"?><Root><Result>FAIL</Result></Root>'
-            mock_post.return_value = mock_response
+    def test_login_success_case_insensitive(self, session_manager, requests_mock):
+        """Test that the SUCCESS sentinel is matched regardless of case."""
+        requests_mock.post(
+            session_manager.config.login_url,
+            content=b'<?xml version="1.0"?><Root><Result>Success</Result></Root>',
+        )
 
-            with pytest.raises(AuthenticationError):
-                session_manager.login()
+        assert session_manager.login() is True
 
-    def test_login_network_error(self, session_manager):
-        """Test handling of network errors during login."""
-        with patch.object(session_manager.session, "post") as mock_post:
-            mock_post.side_effect = requests.exceptions.ConnectionError()
+    def test_login_authentication_failure(self, session_manager, requests_mock):
+        """Test authentication failure with invalid credentials."""
+        requests_mock.post(
+            session_manager.config.login_url,
+            content=XML_FAIL,
+        )
 
-            with pytest.raises(NetworkError):
-                session_manager.login()
+        with pytest.raises(AuthenticationError):
+            session_manager.login()
 
-    def test_build_login_xml(self, session_manager):
-        """Test XML body construction for login."""
-        xml = session_manager._build_login_xml()
+    def test_login_network_error(self, session_manager, requests_mock):
+        """Test handling of network errors during login."""
+        requests_mock.post(
+            session_manager.config.login_url, exc=requests.exceptions.ConnectionError
+        )
 
-        assert '<?xml version="1.0"' in xml
-        assert "http://www.nexacroplatform.com/platform/dataset" in xml
-        assert "<Parameters>" in xml
-        assert '<Parameter id="RTYPE">XML</Parameter>' in xml
-        assert '<Parameter id="DB">CS</Parameter>' in xml
-        assert '<Parameter id="DBUSER">POTAL_USER</Parameter>' in xml
-        assert '<Dataset id="input">' in xml
-        assert '<Col id="userId">test_user</Col>' in xml
-        assert '<Col id="userPass">test_pass</Col>' in xml
+        with pytest.raises(NetworkError):
+            session_manager.login()
 
 
 class TestLicenseRequest:
     """Tests for license request functionality (TEST-license-request-003)"""
 
-    def test_request_license_email_success(self, session_manager):
-        """Test successful license request submission."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = '<?xml version="1.0"?><Root><Result>SUCCESS</Result></Root>'
-            mock_get.return_value = mock_response
-
-            result = session_manager.request_license_email()
-
-            assert result is True
-            assert mock_get.call_count == 1
-
-    def test_request_license_email_with_params(self, session_manager):
-        """Test that license request includes proper query parameters."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = '<?xml version="1.0"?><Root><Result>SUCCESS</Result></Root>'
-            mock_get.return_value = mock_response
-
-            session_manager.request_license_email()
-
-            call_args = mock_get.call_args
-            assert "params" in call_args.kwargs
-            params = call_args.kwargs["params"]
-
-            # Verify all required parameters
-            assert params["service"] == "xupservice"
-            assert params["domain"] == "NEXTp"
-            assert params["model"] == "CE_LicenseEMailSend_R01"
-            assert params["format"] == "xml"
-            assert params["version"] == "xplatform"
-            assert params["p_ConType"] == "TECH2"
-            assert params["p_Product"] == "NP14"
-            assert params["p_Language"] == "KOR"
-            assert params["p_CustomID"] == "test_customer"
-            assert params["p_Email"] == "test@example.com"
-            assert params["p_Merge"] == "N"
-            assert params["zip"] == "false"
-
-    def test_request_license_email_failure(self, session_manager):
-        """Test handling of license request failure."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = '<?xml version="1.0"?><Root><Result>FAIL</Result></Root>'
-            mock_get.return_value = mock_response
-
-            with pytest.raises(LicenseRequestError):
-                session_manager.request_license_email()
-
-    def test_request_license_email_http_200_without_success(self, session_manager):
-        """Test that HTTP 200 without SUCCESS text should fail (P1 bug fix)."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            # Simulate HTTP 200 with error page content (no SUCCESS or FAIL)
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = (
-                "<html><body><h1>Error Page</h1><p>Something went wrong</p></body></html>"
-            )
-            mock_get.return_value = mock_response
-
-            with pytest.raises(LicenseRequestError, match="Unknown response"):
-                session_manager.request_license_email()
-
-    def test_request_license_email_http_200_with_empty_response(self, session_manager):
-        """Test that HTTP 200 with empty response should fail (P1 bug fix)."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = ""
-            mock_get.return_value = mock_response
-
-            with pytest.raises(LicenseRequestError, match="Unknown response"):
+    @pytest.mark.parametrize(
+        ("response", "expected", "match"),
+        [
+            pytest.param(
+                {"content": XML_OK},
+                True,
+                None,
+                id="success",
+            ),
+            pytest.param(
+                {"content": XML_FAIL},
+                LicenseRequestError,
+                "License request failed$",
+                id="failure",
+            ),
+            pytest.param(
+                # A FAIL sentinel wins even when SUCCESS appears earlier
+                {"content": b"<Root><Code>success</Code><Result>fail</Result></Root>"},
+                LicenseRequestError,
+                "License request failed$",
+                id="fail-takes-precedence",
+            ),
+            pytest.param(
+                # HTTP 200 with error page content, no SUCCESS or FAIL (P1 bug fix)
+                {
+                    "content": (
+                        b"<html><body><h1>Error Page</h1><p>Something went wrong</p></body></html>"
+                    )
+                },
+                LicenseRequestError,
+                "Unknown response",
+                id="http-200-without-success",
+            ),
+            pytest.param(
+                # HTTP 200 with empty response (P1 bug fix)
+                {"content": b""},
+                LicenseRequestError,
+                "Unknown response",
+                id="http-200-with-empty-response",
+            ),
+            pytest.param(
+                {"exc": requests.exceptions.ConnectionError},
+                NetworkError,
+                None,
+                id="network-error",
+            ),
+        ],
+    )
+    def test_request_license_email_outcome(
+        self, session_manager, requests_mock, response, expected, match
+    ):
+        """Test license request result for each kind of portal response."""
+        requests_mock.get(session_manager.config.license_url, **response)
+
+        if expected is True:
+            assert session_manager.request_license_email() is True
+            assert requests_mock.call_count == 1
+        else:
+            with pytest.raises(expected, match=match):
                 session_manager.request_license_email()
 
-    def test_request_license_email_network_error(self, session_manager):
-        """Test handling of network errors during license request."""
-        with patch.object(session_manager.session, "get") as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError()
-
-            with pytest.raises(NetworkError):
-                session_manager.request_license_email()
+    def test_request_license_email_with_params(self, session_manager, requests_mock):
+        """Test that license request includes proper query parameters."""
+        requests_mock.get(
+            session_manager.config.license_url,
+            content=XML_OK,
+        )
+
+        session_manager.request_license_email()
+
+        params = requests_mock.last_request.qs
+
+        # Verify all required parameters
+        assert params["service"] == ["xupservice"]
+        assert params["domain"] == ["NEXTp"]
+        assert params["model"] == ["CE_LicenseEMailSend_R01"]
+        assert params["format"] == ["xml"]
+        assert params["version"] == ["xplatform"]
+        assert params["p_ConType"] == ["TECH2"]
+        assert params["p_Product"] == ["NP14"]
+        assert params["p_Language"] == ["KOR"]
+        assert params["p_CustomID"] == ["test_customer"]
+        assert params["p_Email"] == ["test@example.com"]
+        assert params["p_Merge"] == ["N"]
+        assert params["zip"] == ["false"]
 
     def test_build_license_params(self, session_manager):
         """Test query parameter construction for license request."""
-        params = session_manager._build_license_params()
+        params = session_manager._license_params
 
         assert params["service"] == "xupservice"
         assert params["domain"] == "NEXTp"
@@ -243,6 +274,15 @@ class TestLicenseRequest:
         assert params["p_Merge"] == "N"
         assert params["zip"] == "false"
 
+    def test_license_params_built_once(self, session_manager):
+        """Test that license params are cached per session manager."""
+        assert session_manager._license_params is session_manager._license_params
+
+    def test_license_params_read_only(self, session_manager):
+        """Test that the cached license params cannot be mutated between calls."""
+        with pytest.raises(TypeError):
+            session_manager._license_params["p_Email"] = "other@example.com"
+
 
 class TestUserAgent:
     """Tests for User-Agent header configuration"""
@@ -251,3 +291,108 @@ class TestUserAgent:
         """Test that User-Agent header is set in session."""
         assert "User-Agent" in session_manager.session.headers
         assert "Mozilla" in session_manager.session.headers["User-Agent"]
+
+
+class TestConnectionPooling:
+    """Tests for connection pool and retry adapter configuration"""
+
+    def test_https_adapter_retries_use_config(self, session_manager):
+        """Test that HTTPS adapter retries are wired to config.max_retries."""
+        adapter = session_manager.session.get_adapter("https://")
+
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter.max_retries.total == session_manager.config.max_retries
+        assert 503 in adapter.max_retries.status_forcelist
+
+    def test_adapter_does_not_retry_reads(self, session_manager):
+        """Test that read errors are raised instead of retried on every adapter."""
+        for url in ("https://", session_manager.config.license_url):
+            retries = session_manager.session.get_adapter(url).max_retries
+            assert retries.connect == session_manager.config.max_retries
+            assert retries.read is False
+
+    def test_license_host_has_no_status_retries(self, session_manager):
+        """Test that the license GET is never re-sent because of a response status."""
+        license_adapter = session_manager.session.get_adapter(session_manager.config.license_url)
+
+        assert license_adapter is not session_manager.session.get_adapter("https://")
+        assert not license_adapter.max_retries.is_retry("GET", 503, has_retry_after=True)
+
+    def test_license_read_timeout_not_resent(self, mock_config, stub_server):
+        """Test that a stalled license GET is sent once and reported as a timeout."""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        config = replace(mock_config, license_url=f"{base_url}/stall", request_timeout=0.2)
+
+        with pytest.raises(NetworkError, match="timeout"):
+            SessionManager(config).request_license_email()
+
+        assert stub_server.hits["/stall"] == 1
+
+    def test_license_unavailable_not_resent(self, mock_config, stub_server):
+        """Test that a 503 from the license host is reported without re-sending."""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        config = replace(mock_config, license_url=f"{base_url}/unavailable")
+
+        with pytest.raises(NetworkError, match="HTTP error"):
+            SessionManager(config).request_license_email()
+
+        assert stub_server.hits["/unavailable"] == 1
+
+    def test_homepage_unavailable_retried(self, mock_config, stub_server):
+        """Test that a 503 from the portal homepage is retried without honouring Retry-After."""
+        base_url = f"http://127.0.0.1:{stub_server.server_port}"
+        config = replace(mock_config, homepage_url=f"{base_url}/unavailable", max_retries=1)
+
+        start = time.monotonic()
+        with pytest.raises(NetworkError, match="^HTTP error.*too many 503 error responses"):
+            SessionManager(config).establish_session()
+
+        assert stub_server.hits["/unavailable"] == 2
+        assert time.monotonic() - start < stub_server.retry_after
+
+    def test_adapter_mounted_for_both_schemes(self, session_manager):
+        """Test that plain HTTP also goes through the pooled retry adapter."""
+        https_adapter = session_manager.session.get_adapter("https://")
+
+        assert session_manager.session.get_adapter("http://") is https_adapter
+        assert https_adapter._pool_connections == POOL_CONNECTIONS
+        assert https_adapter._pool_maxsize == POOL_MAXSIZE
+
+
+class TestContextManager:
+    """Tests for session cleanup via the context manager protocol"""
+
+    def test_exit_closes_session(self, mock_config, mocker):
+        """Test that leaving the context closes the HTTP session."""
+        with SessionManager(mock_config) as session_manager:
+            mock_close = mocker.spy(session_manager.session, "close")
+
+        mock_close.assert_called_once()
+
+    def test_exit_closes_session_on_error(self, mock_config, mocker):
+        """Test that the HTTP session is closed even when the workflow raises."""
+        with pytest.raises(NetworkError), SessionManager(mock_config) as session_manager:
+            mock_close = mocker.spy(session_manager.session, "close")
+            raise NetworkError("boom")
+
+        mock_close.assert_called_once()
+
+    def test_exit_waits_for_warm_up(self, mock_config, requests_mock, mocker):
+        """Test that the session is not closed while the warm-up request is in flight."""
+        events = []
+        release = threading.Event()
+
+        def slow_head(*args, **kwargs):
+            release.wait(WARM_UP_TIMEOUT)
+            events.append("head")
+
+        requests_mock.get(mock_config.homepage_url)
+        with SessionManager(replace(mock_config, warm_up_connections=True)) as session_manager:
+            mocker.patch.object(session_manager, "_warm_up_license_host", side_effect=slow_head)
+            mocker.patch.object(
+                session_manager.session, "close", side_effect=lambda: events.append("close")
+            )
+            session_manager.establish_session()
+            threading.Timer(0.1, release.set).start()
+
+        assert events == ["head", "close"]